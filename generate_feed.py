@@ -1,16 +1,32 @@
 import requests # Für HTTP-Anfragen an die Zotero API
-import xml.etree.ElementTree as ET # Zum Erstellen und Bearbeiten von XML-Dokumenten (RSS-Feed)
+from requests.adapters import HTTPAdapter # Für Connection-Pooling und automatische Wiederholungen
+from urllib3.util.retry import Retry # Für Wiederholungen mit exponentiellem Backoff bei 429/5xx
+from urllib3.util import make_headers # Für den Accept-Encoding Header passend zu den installierten Dekompressoren
+from xml.sax.saxutils import escape # Zum Maskieren von Sonderzeichen (&, <, >) in XML-Text und -Attributen
+try:
+    import orjson # Schneller JSON-Parser für die Antworten der Zotero API
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False # Fallback auf response.json() (Standardbibliothek)
 from datetime import datetime, timezone # Für Datums- und Zeitoperationen, insbesondere für Zeitstempel im RSS-Feed
 import re # Für reguläre Ausdrücke, z.B. zum Extrahieren von Jahreszahlen und zum Entfernen von HTML-Tags
 from urllib.parse import quote, urlparse, urlunparse # Für URL-Encoding und -Parsing, um sichere und korrekte URLs zu erstellen
+import json # Für das Lesen und Schreiben des Item-Zwischenspeichers
 import html # Für das Dekodieren von HTML-Entitäten (z.B. &amp; zu &)
 import logging # Für das Protokollieren von Informationen, Warnungen und Fehlern während der Skriptausführung
+import os # Für das atomare Ersetzen der Feed- und Zwischenspeicher-Dateien
+from concurrent.futures import ThreadPoolExecutor # Für das parallele Abrufen mehrerer API-Seiten
+from itertools import chain, zip_longest # Zum fortlaufenden Schreiben und zeilenweisen Vergleichen der Feeds
+from functools import lru_cache # Für das Zwischenspeichern von Ergebnissen reiner Hilfsfunktionen (z.B. Datumsparsing)
+from operator import itemgetter # Sortierschlüssel ohne Lambda (in C implementiert)
 
 # --- Globale Konfiguration (Institutsebene) ---
 GROUP_ID = "5560460" # Die Zotero Gruppen ID vom IAU
 DEFAULT_AG_OUTPUT_SUFFIX = "_zotero_rss.xml" # Standard-Suffix für AG-Dateinamen
 SINGLE_AUTHOR_SUFFIX = "_single_author" # Zusatz für Dateinamen der "Single Author"-Version
 MAIN_FEED_FILENAME = "zotero_rss_minimal.xml" # Dateiname für den Haupt-Feed des Instituts
+LIBRARY_VERSION_FILENAME = ".zotero_version" # Speichert die Bibliotheksversion des letzten erfolgreichen Laufs
+ITEM_CACHE_FILENAME = ".zotero_items.json" # Zwischengespeicherte Item-Daten für den inkrementellen Abruf ('since')
 
 # RSS Channel Konfiguration (Basis, gilt für alle Feeds, wenn nicht spezifisch überschrieben)
 RSS_CHANNEL_LINK = "https://www.iau.uni-frankfurt.de" # Hauptlink des Instituts
@@ -18,9 +34,18 @@ RSS_CHANNEL_LANGUAGE = "de-DE" # Sprache des Feeds
 
 # Zotero API Abruf Konfiguration (allgemein gültig)
 ZOTERO_ITEM_TYPE = "items/top" # Nur Top-Level Items
+ZOTERO_CHANGES_ITEM_TYPE = "items" # Inkrementeller Abgleich über alle Items, damit nachträglich untergeordnete Einträge erkannt werden
 MAX_LIMIT_PER_REQUEST = 100 # Zotero API Limit pro Seite
 SORT_BY = "dateAdded" # Sortierung beim API-Abruf (wird später in Python überschrieben durch Datumssortierung)
 DIRECTION = "desc" # Sortierrichtung beim API-Abruf
+# Für die Feeds benötigte Item-Felder; nur diese werden zwischengespeichert (Änderung erzwingt einen vollständigen Abruf)
+CACHED_ITEM_FIELDS = ('key', SORT_BY, 'title', 'creators', 'date', 'journalAbbreviation', 'publicationTitle', 'volume', 'DOI', 'url', 'collections')
+MAX_PARALLEL_REQUESTS = 8 # Anzahl der gleichzeitig abgerufenen Seiten (nach der ersten Seite)
+MAX_RETRIES = 5 # Maximale Anzahl an Wiederholungen bei Rate Limit (429) oder Serverfehlern (5xx)
+HTTP_POOL_SIZE = 16 # Anzahl der offen gehaltenen (keep-alive) Verbindungen zur Zotero API
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504) # Statuscodes, bei denen eine Anfrage wiederholt wird
+RETRY_BACKOFF_FACTOR = 0.5 # Basis-Wartezeit in Sekunden für den exponentiellen Backoff
+MAX_VERSION_RETRIES = 2 # Neustarts eines Abrufs, wenn sich die Bibliothek währenddessen ändert (HTTP 412)
 
 # GitHub Pages Konfiguration (Basis für die Feed-URL-Konstruktion)
 GITHUB_USERNAME = "184467gianluca"
@@ -36,14 +61,76 @@ MONTH_MAP_EN = {
     'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12
 }
 MONTH_MAP_COMBINED = {**MONTH_MAP_DE, **MONTH_MAP_EN}
+# Englische Kurzformen für RFC-822-Zeitstempel (wie von RSS verlangt; bleiben auch bei einem späteren setlocale-Aufruf englisch)
+RFC822_WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+RFC822_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+LRU_CACHE_SIZE = 4096 # Maximale Anzahl zwischengespeicherter Ergebnisse pro Hilfsfunktion
+FEED_WRITE_BUFFER_SIZE = 1 << 20 # Schreibpuffer (1 MiB) für die Feed-Dateien, damit die Item-Blöcke in wenigen Systemaufrufen geschrieben werden
 # --- Ende Globale Konfiguration ---
 
 # XML-Namespace für Atom Link
 ATOM_NS = "http://www.w3.org/2005/Atom"
+ATTRIBUTE_ENTITIES = {'"': '&quot;'} # Zusätzlich zu maskierende Zeichen in Attributwerten (in doppelten Anführungszeichen)
+
+# Vorlagen für den RSS-Feed: Der Feed wird direkt als Text erzeugt (kein XML-Objektmodell),
+# Einrückung und Aufbau entsprechen der bisherigen Ausgabe. Alle Werte müssen bereits maskiert sein.
+RSS_CHANNEL_HEADER_TEMPLATE = (
+    "<?xml version='1.0' encoding='utf-8'?>\n"
+    "<rss xmlns:atom=\"{atom_ns}\" version=\"2.0\">\n"
+    "  <channel>\n"
+    "    <title>{title}</title>\n"
+    "    <link>{link}</link>\n"
+    "    <description>{description}</description>\n"
+    "{language}"
+    "    <lastBuildDate>{build_date}</lastBuildDate>\n"
+    "    <pubDate>{build_date}</pubDate>\n"
+    "    <generator>{generator}</generator>\n"
+    "    <atom:link href=\"{feed_url}\" rel=\"self\" type=\"application/rss+xml\" />\n"
+)
+RSS_LANGUAGE_TEMPLATE = "    <language>{}</language>\n"
+RSS_ITEM_TEMPLATE = (
+    "    <item>\n"
+    "      <title>{title}</title>\n"
+    "{link}"
+    "{categories}"
+    "      <guid isPermaLink=\"{is_permalink}\">{guid}</guid>\n"
+    "      <pubDate>{pub_date}</pubDate>\n"
+    "    </item>\n"
+)
+RSS_LINK_TEMPLATE = "      <link>{}</link>\n"
+RSS_CATEGORY_TEMPLATE = "      <category>{}</category>\n"
+RSS_FEED_FOOTER = "  </channel>\n</rss>"
+
+# Vorkompilierte reguläre Ausdrücke (werden pro Item mehrfach benötigt)
+HTML_TAG_RE = re.compile(r'<[^>\n]*>') # HTML-Tags in Titeln und Zeitschriftennamen (gleiche Treffer wie '<.*?>': bis zur ersten '>' derselben Zeile)
+YEAR_RE = re.compile(r'\b(\d{4})\b') # Vierstellige Jahreszahl in Datumsangaben
+NUMERIC_DATE_RE = re.compile(r'(\d{4})(?:-(1[0-2]|0[1-9]|[1-9])(?:-(3[01]|[12]\d|0[1-9]|[1-9]| [1-9]))?)?') # JJJJ, JJJJ-MM, JJJJ-MM-TT (Teilmuster wie strptime %Y, %m, %d)
+DETAILED_DATE_RE = re.compile(r'^\d{4}-\d{2}(?:-\d{2})?$') # Datumsangaben der Form JJJJ-MM oder JJJJ-MM-TT (zusätzliche Kategorie)
+DOI_PREFIX_RE = re.compile(r'^(?:doi\s*:?\s*/*)+', re.IGNORECASE) # Präfixe wie "doi:" oder "DOI: /" vor der eigentlichen DOI
+SAFE_DOI_URL_RE = re.compile(r'^https?://doi\.org/[A-Za-z0-9_.~/:()-]*$') # DOI-URLs, die bereits sicher kodiert sind
+SAFE_URL_RE = re.compile(r'^https?://[A-Za-z0-9_.~%:@+-]+(?:/[A-Za-z0-9_.~/:@&=+$,%-]*)?(?:\?[A-Za-z0-9_.~/:@&=+$,%;?-]+)?$') # http(s)-URLs, deren Pfad bereits sicher kodiert ist
+DOI_URL_PREFIXES = ('http://doi.org/', 'https://doi.org/') # DOIs, die bereits als vollständige URL vorliegen
+FEED_TIMESTAMP_RE = re.compile(rb'<(lastBuildDate|pubDate)>[^<]*</\1>') # Zeitstempel, die sich bei jedem Lauf ändern
 
 # Logging Konfiguration
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Gemeinsame HTTP-Session für alle API-Anfragen: Verbindungen bleiben offen (Keep-Alive) und werden
+# über alle Seiten und Feeds wiederverwendet. Bei 429/5xx wird mit exponentiellem Backoff wiederholt,
+# ein 'Retry-After' Header der API wird dabei beachtet.
+# Komprimierte Antworten werden explizit angefordert (gzip/deflate, zusätzlich br wenn 'brotli' installiert ist).
+SESSION = requests.Session()
+SESSION.headers.update({
+    'Zotero-API-Version': '3',
+    'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding'],
+})
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+    max_retries=Retry(total=MAX_RETRIES, backoff_factor=RETRY_BACKOFF_FACTOR,
+                      status_forcelist=RETRY_STATUS_CODES, raise_on_status=False)
+))
+
 
 # === Konfiguration der einzelnen Arbeitsgruppen ===
 AG_CONFIGURATIONS = [
@@ -62,10 +149,18 @@ def clean_html(raw_html):
     """Entfernt HTML-Tags aus einem String und dekodiert HTML-Entitäten."""
     if not raw_html:
         return ""
-    raw_html_str = str(raw_html)
-    cleanr = re.compile('<.*?>')
-    cleantext = re.sub(cleanr, '', raw_html_str)
-    return html.unescape(cleantext).strip()
+    return clean_html_cached(str(raw_html))
+
+@lru_cache(maxsize=LRU_CACHE_SIZE)
+def clean_html_cached(raw_html_str):
+    """Bereinigt einen String (siehe clean_html).
+    Zeitschriftennamen wiederholen sich über viele Einträge, daher wird jedes Ergebnis pro String zwischengespeichert.
+    """
+    # Die meisten Titel enthalten weder Tags noch Entitäten; die 'in'-Prüfungen ersparen dann Regex und Unescape
+    cleantext = HTML_TAG_RE.sub('', raw_html_str) if '<' in raw_html_str else raw_html_str
+    if '&' in cleantext:
+        cleantext = html.unescape(cleantext)
+    return cleantext.strip()
 
 def parse_date(date_str):
     """Versucht, einen Datumsstring in ein datetime-Objekt umzuwandeln.
@@ -74,35 +169,30 @@ def parse_date(date_str):
     """
     if not date_str:
         return datetime.min # Gib ein sehr altes Datum zurück, um Einträge ohne Datum nach hinten zu sortieren
-    
-    date_str_val = str(date_str).strip()
-    
-    # Priorität 1: YYYY-MM-DD
-    try:
-        return datetime.strptime(date_str_val, '%Y-%m-%d')
-    except ValueError:
-        pass
-        
-    # Priorität 2: YYYY-MM
-    try:
-        return datetime.strptime(date_str_val, '%Y-%m')
-    except ValueError:
-        pass
+    return parse_date_cached(str(date_str).strip())
+
+@lru_cache(maxsize=LRU_CACHE_SIZE)
+def parse_date_cached(date_str_val):
+    """Parst einen bereinigten Datumsstring (siehe parse_date).
+    Viele Einträge teilen sich dieselbe Datumsangabe, daher wird jedes Ergebnis pro String zwischengespeichert.
+    """
+    # Priorität 1, 2 und 4: YYYY-MM-DD, YYYY-MM oder nur YYYY (wie strptime, aber ohne dessen Parser-Aufbau)
+    numeric_match = NUMERIC_DATE_RE.fullmatch(date_str_val)
+    if numeric_match:
+        year_str, month_str, day_str = numeric_match.groups()
+        try:
+            return datetime(int(year_str), int(month_str or 1), int(day_str or 1))
+        except ValueError:
+            pass # Ungültiger Monat/Tag (z.B. 2023-02-30): weiter mit der Monatsnamen-Erkennung
 
     # Priorität 3: Monatsname YYYY (z.B. "Mai 2024" oder "december 2023")
     date_str_val_lower = date_str_val.lower()
-    year_match = re.search(r'\b(\d{4})\b', date_str_val_lower)
+    year_match = YEAR_RE.search(date_str_val_lower)
     if year_match:
         year = int(year_match.group(1))
         for month_name, month_num in MONTH_MAP_COMBINED.items():
             if month_name in date_str_val_lower:
                 return datetime(year, month_num, 1) # Gibt den ersten Tag des erkannten Monats zurück
-    
-    # Priorität 4: Nur YYYY
-    try:
-        return datetime.strptime(date_str_val, '%Y')
-    except ValueError:
-        pass
 
     logging.warning(f"Konnte kein valides Datum aus '{date_str_val}' für die Sortierung parsen.")
     return datetime.min # Fallback, wenn kein Format passt
@@ -111,23 +201,37 @@ def extract_year(date_str):
     """Extrahiert nur die vierstellige Jahreszahl aus einem Datumsstring für die Anzeige."""
     if not date_str:
         return None
-    date_str_val = str(date_str)
-    match = re.search(r'\b(\d{4})\b', date_str_val)
+    return extract_year_cached(str(date_str))
+
+@lru_cache(maxsize=LRU_CACHE_SIZE)
+def extract_year_cached(date_str_val):
+    """Sucht die Jahreszahl in einem Datumsstring (siehe extract_year), zwischengespeichert pro String wie parse_date_cached."""
+    match = YEAR_RE.search(date_str_val)
     if match:
         return match.group(1)
     logging.warning(f"Konnte kein Jahr aus '{date_str_val}' für die Anzeige extrahieren.")
     return None
 
-def format_authors(creators, single_author_mode=False):
-    """Formatiert die Autorenliste. Im single_author_mode wird nur der erste Autor mit 'et al.' angezeigt."""
-    if not creators:
-        return ""
-        
+def author_names_fast(creator_fields):
+    """Schneller Pfad für format_authors: erwartet (creatorType, lastName, firstName, name)-Tupel mit String-Werten,
+    wie sie die Zotero API liefert.
+    """
+    author_list = []
+    for creator_type, last_name, first_name, name in creator_fields:
+        if creator_type != 'author':
+            continue
+        # Bewusst ohne Typprüfung: Ist ein Feld kein String (z.B. None), löst .strip() einen AttributeError aus,
+        # format_authors fängt ihn ab und verwendet dann author_names_defensive
+        last_name, first_name, name = last_name.strip(), first_name.strip(), name.strip()
+        if last_name and first_name:
+            author_list.append(f"{last_name}, {first_name}")
+        elif last_name or first_name or name:
+            author_list.append(last_name or first_name or name)
+    return author_list
+
+def author_names_defensive(creators):
+    """Langsamer Pfad für format_authors, der beliebige Typen in der 'creators'-Liste toleriert."""
     author_list = []
-    if not isinstance(creators, list):
-        logging.warning(f"Unerwartetes Format für 'creators': {creators}. Erwarte eine Liste.")
-        return ""
-        
     for creator in creators:
         if isinstance(creator, dict) and creator.get('creatorType') == 'author':
             last_name = str(creator.get('lastName', '')).strip()
@@ -143,7 +247,34 @@ def format_authors(creators, single_author_mode=False):
                 name_str = str(creator['name']).strip()
             if name_str:
                 author_list.append(name_str)
-    
+    return author_list
+
+def format_authors(creators, single_author_mode=False):
+    """Formatiert die Autorenliste. Im single_author_mode wird nur der erste Autor mit 'et al.' angezeigt."""
+    if not creators:
+        return ""
+        
+    if not isinstance(creators, list):
+        logging.warning(f"Unerwartetes Format für 'creators': {creators}. Erwarte eine Liste.")
+        return ""
+
+    try:
+        # Hashbarer Schlüssel aus den relevanten Feldern; viele Einträge teilen sich dieselbe Autorenliste
+        creator_fields = tuple((creator.get('creatorType'), creator.get('lastName', ''), creator.get('firstName', ''), creator.get('name', ''))
+                               for creator in creators)
+        return format_authors_cached(creator_fields, single_author_mode)
+    except (AttributeError, TypeError):
+        return join_author_names(author_names_defensive(creators), single_author_mode)
+
+@lru_cache(maxsize=LRU_CACHE_SIZE)
+def format_authors_cached(creator_fields, single_author_mode):
+    """Formatiert die Autorenliste aus den Feld-Tupeln (siehe format_authors), zwischengespeichert pro Autorenliste und Modus.
+    Jede Autorenliste wird in mehreren Feeds und in beiden Modi verwendet.
+    """
+    return join_author_names(author_names_fast(creator_fields), single_author_mode)
+
+def join_author_names(author_list, single_author_mode):
+    """Verbindet die Autorennamen mit "; " bzw. kürzt sie im single_author_mode auf den ersten Autor mit 'et al.'."""
     if not author_list:
         return ""
 
@@ -156,41 +287,21 @@ def format_authors(creators, single_author_mode=False):
         return "; ".join(author_list)
 
 def find_best_link_json(item_data, fallback_url=None):
-    """Sucht den besten Link (DOI, dann URL) und verwendet ggf. eine Fallback-URL."""
-    if not isinstance(item_data, dict):
-        logging.warning(f"Unerwartetes Format für item_data in find_best_link_json: {item_data}")
-        return fallback_url
-        
+    """Sucht den besten Link (DOI, dann URL) und verwendet ggf. eine Fallback-URL.
+    item_data ist bereits vom Aufrufer (prepare_feed_items) als dict geprüft.
+    """
     doi = item_data.get('DOI')
-    if doi and str(doi).strip():
-        doi_text = str(doi).strip()
-        doi_text = re.sub(r'^(doi\s*:?\s*/*)+', '', doi_text, flags=re.IGNORECASE).strip()
-        if doi_text:
-            safe_doi_text = quote(doi_text, safe='/:()._-')
-            if doi_text.startswith('http://doi.org/') or doi_text.startswith('https://doi.org/'):
-                try:
-                    parsed = urlparse(doi_text)
-                    safe_path = quote(parsed.path, safe='/:()._-')
-                    scheme = parsed.scheme or 'https'
-                    netloc = parsed.netloc or 'doi.org'
-                    return urlunparse((scheme, netloc, safe_path, parsed.params, parsed.query, parsed.fragment))
-                except Exception as e:
-                    logging.error(f"Fehler beim Parsen/Kodieren der DOI-URL '{doi_text}': {e}")
-                    return f"https://doi.org/{safe_doi_text}"
-            else:
-                return f"https://doi.org/{safe_doi_text}"
-        else:
-            logging.warning(f"DOI '{str(doi)}' war nach Bereinigung leer.")
+    doi_text = str(doi).strip() if doi else ''
+    if doi_text:
+        doi_link = doi_link_cached(doi_text)
+        if doi_link:
+            return doi_link
+        logging.warning(f"DOI '{str(doi)}' war nach Bereinigung leer.")
 
     url = item_data.get('url')
-    if url and str(url).strip().startswith(('http://', 'https://')):
-        try:
-            parsed = urlparse(str(url).strip())
-            safe_path = quote(parsed.path, safe='/:@&=+$,-.%')
-            return urlunparse((parsed.scheme, parsed.netloc, safe_path, parsed.params, parsed.query, parsed.fragment))
-        except Exception as e:
-            logging.warning(f"Konnte URL '{url}' nicht sicher parsen/kodieren, verwende sie unverändert: {e}")
-            return str(url).strip()
+    url_text = str(url).strip() if url else ''
+    if url_text.startswith(('http://', 'https://')):
+        return url_link_cached(url_text)
 
     item_key = item_data.get('key', ' unbekanntem Key')
     if fallback_url:
@@ -200,176 +311,463 @@ def find_best_link_json(item_data, fallback_url=None):
         logging.warning(f"Kein spezifischer Link (DOI/URL) und kein Fallback-URL für Item mit Key {item_key} gefunden.")
         return None
 
-def get_categories_json(item_data, date_str):
-    """Extrahiert Kategorien für einen RSS-Eintrag. Fügt das Jahr und ggf. das detailliertere Datum hinzu."""
+@lru_cache(maxsize=LRU_CACHE_SIZE)
+def doi_link_cached(doi_text):
+    """Bereinigt eine DOI und gibt sie als sicher kodierte doi.org-URL zurück (None, falls nach der Bereinigung nichts übrig bleibt).
+    Jedes Item wird in mehreren Feeds verwendet, daher wird das Ergebnis pro DOI zwischengespeichert.
+    """
+    # Der reguläre Ausdruck wird nur benötigt, wenn die DOI überhaupt mit "doi" beginnt (selten)
+    if doi_text[:3].lower() == 'doi':
+        doi_text = DOI_PREFIX_RE.sub('', doi_text).strip()
+    if not doi_text:
+        return None
+    if doi_text.startswith(DOI_URL_PREFIXES):
+        # Häufigster Fall: die URL enthält nur Zeichen, die quote() ohnehin unverändert lässt
+        if SAFE_DOI_URL_RE.match(doi_text):
+            return doi_text
+        try:
+            parsed = urlparse(doi_text)
+            safe_path = quote(parsed.path, safe='/:()._-')
+            scheme = parsed.scheme or 'https'
+            netloc = parsed.netloc or 'doi.org'
+            return urlunparse((scheme, netloc, safe_path, parsed.params, parsed.query, parsed.fragment))
+        except Exception as e:
+            logging.error(f"Fehler beim Parsen/Kodieren der DOI-URL '{doi_text}': {e}")
+    return f"https://doi.org/{quote(doi_text, safe='/:()._-')}"
+
+@lru_cache(maxsize=LRU_CACHE_SIZE)
+def url_link_cached(url_text):
+    """Kodiert den Pfad einer http(s)-URL sicher (siehe find_best_link_json), zwischengespeichert pro URL."""
+    # Häufigster Fall: die URL ist bereits sicher kodiert, urlparse/quote würden sie unverändert lassen
+    if SAFE_URL_RE.match(url_text):
+        return url_text
+    try:
+        parsed = urlparse(url_text)
+        safe_path = quote(parsed.path, safe='/:@&=+$,-.%')
+        return urlunparse((parsed.scheme, parsed.netloc, safe_path, parsed.params, parsed.query, parsed.fragment))
+    except Exception as e:
+        logging.warning(f"Konnte URL '{url_text}' nicht sicher parsen/kodieren, verwende sie unverändert: {e}")
+        return url_text
+
+def get_categories_json(date_str, year):
+    """Extrahiert Kategorien für einen RSS-Eintrag. Fügt das Jahr (bereits per extract_year ermittelt) und ggf. das detailliertere Datum hinzu."""
     categories = []
-    year = extract_year(date_str)
     if year:
         categories.append(year)
     
     if date_str:
-        date_str_val = str(date_str).strip()
-        match_detailed_date = re.match(r'^\d{4}-\d{2}(?:-\d{2})?$', date_str_val)
+        date_str_val = date_str.strip()
+        match_detailed_date = DETAILED_DATE_RE.match(date_str_val)
         if match_detailed_date:
             categories.append(match_detailed_date.group(0))
 
-    return list(set(categories))
+    # Keine Duplikate möglich: das Jahr ist vierstellig, das detaillierte Datum enthält immer einen Bindestrich
+    return categories
 
 
-def fetch_zotero_items(group_id_param, item_type_param, sort_by_param, direction_param, limit_param, single_author_mode,
-                       collection_key_override=None, ag_name_label_override="Gesamtinstitut"):
-    """Holt alle Einträge von Zotero und sortiert sie nach Publikationsdatum."""
-    all_items_data = []
-    start = 0
-    total_results = None
-    
-    current_fallback_url = None
+def iter_zotero_pages(session, fetch_url, base_params, limit_param, label):
+    """Liefert (start, response)-Paare aller API-Seiten in aufsteigender Reihenfolge.
+    Die erste Seite wird synchron abgerufen. Sobald 'Total-Results' bekannt ist, werden alle weiteren Seiten
+    parallel angefragt; ohne verwertbaren Header wird sequenziell weitergeblättert, bis der Aufrufer abbricht.
+    Alle weiteren Seiten werden an die Bibliotheksversion der ersten Seite gebunden ('If-Unmodified-Since-Version'):
+    Ändert sich die Bibliothek während des Blätterns, antwortet die API mit 412 statt mit einer inkonsistenten Seite.
+    """
+    page_headers = {}
 
-    if collection_key_override:
-        fetch_url = f"https://api.zotero.org/groups/{group_id_param}/collections/{collection_key_override}/{item_type_param}"
-        current_fallback_url = f"https://www.zotero.org/groups/{group_id_param}/collections/{collection_key_override}/items"
-        logging.info(f"Starte Abruf von Zotero für {ag_name_label_override} (Collection Key: {collection_key_override}).")
-    else:
-        fetch_url = f"https://api.zotero.org/groups/{group_id_param}/{item_type_param}"
-        current_fallback_url = f"https://www.zotero.org/groups/{group_id_param}/library"
-        logging.info(f"Starte Abruf von Zotero für {ag_name_label_override} (gesamte Gruppe).")
+    def fetch_page(start):
+        logging.debug("Rufe Einträge ab (%s): Start=%d, Limit=%s", label, start, limit_param)
+        return session.get(fetch_url, params={**base_params, 'start': start}, headers=page_headers, timeout=120)
+
+    response = fetch_page(0)
+    if 'Last-Modified-Version' in response.headers:
+        page_headers['If-Unmodified-Since-Version'] = response.headers['Last-Modified-Version']
+    yield 0, response
 
-    while True:
-        params = {'format': 'json', 'sort': sort_by_param, 'direction': direction_param, 'limit': limit_param, 'start': start}
+    try:
+        total_results = int(response.headers['Total-Results'])
+    except (KeyError, ValueError):
+        total_results = None
+
+    if total_results is None:
+        start = limit_param
+        while True:
+            yield start, fetch_page(start)
+            start += limit_param
+
+    starts = range(limit_param, total_results, limit_param)
+    executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS)
+    try:
+        futures = {start: executor.submit(fetch_page, start) for start in starts}
+        for start in starts:
+            # Future wird beim Ausliefern entfernt, damit die Antwort nach der Verarbeitung freigegeben werden kann
+            yield start, futures.pop(start).result()
+    finally:
+        # Bricht der Aufrufer vorzeitig ab, werden noch nicht gestartete Anfragen verworfen
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def fetch_zotero_item_pages(fetch_url, params, label):
+    """Holt alle Seiten einer Item-Abfrage und gibt (Liste der Items, Bibliotheksversion) zurück, None bei Fehlern.
+    Ändert sich die Bibliothek während des Blätterns (412 oder abweichende 'Last-Modified-Version' einer Seite),
+    wird der Abruf vollständig neu gestartet.
+    """
+    limit_param = params['limit']
+    for attempt in range(MAX_VERSION_RETRIES + 1):
+        all_items_json = []
+        total_results = None
+        library_version = None
+        library_changed = False
         try:
-            logging.info(f"Rufe Einträge ab ({ag_name_label_override}): Start={start}, Limit={limit_param}")
-            headers = {'Zotero-API-Version': '3'}
-            response = requests.get(fetch_url, params=params, headers=headers, timeout=120)
-
-            if response.status_code != 200:
-                logging.error(f"Fehler bei API-Abruf für {ag_name_label_override}. Status: {response.status_code}, URL: {response.url}")
-                if response.status_code == 404: logging.error("-> Gruppe/Collection nicht gefunden.")
-                if response.status_code == 403: logging.error("-> Zugriff verweigert.")
-                if response.status_code == 429: logging.error("-> Zu viele Anfragen (Rate Limit).")
-                return None
-            response.raise_for_status()
-
-            if total_results is None and 'Total-Results' in response.headers:
+            for start, response in iter_zotero_pages(SESSION, fetch_url, params, limit_param, label):
+                if response.status_code == 412:
+                    library_changed = True
+                    break
+                if response.status_code != 200:
+                    logging.error(f"Fehler bei API-Abruf für {label}. Status: {response.status_code}, URL: {response.url}")
+                    if response.status_code == 404: logging.error("-> Gruppe/Collection nicht gefunden.")
+                    if response.status_code == 403: logging.error("-> Zugriff verweigert.")
+                    if response.status_code == 429: logging.error("-> Zu viele Anfragen (Rate Limit).")
+                    return None
+                response.raise_for_status()
+
                 try:
-                    total_results = int(response.headers['Total-Results'])
-                    logging.info(f"Gesamtzahl der Einträge laut API für {ag_name_label_override}: {total_results}")
-                except ValueError:
-                    logging.warning(f"Konnte 'Total-Results' Header nicht als Zahl interpretieren ({ag_name_label_override}).")
-                    total_results = -1
+                    page_version = int(response.headers['Last-Modified-Version'])
+                except (KeyError, ValueError):
+                    page_version = None
+                if start == 0:
+                    library_version = page_version
+                elif library_version is not None and page_version != library_version:
+                    # Zusätzlich zur Vorbedingung: jede Seite muss zur Version der ersten Seite gehören, sonst wie bei 412 neu starten
+                    library_changed = True
+                    break
+                if total_results is None and 'Total-Results' in response.headers:
+                    try:
+                        total_results = int(response.headers['Total-Results'])
+                        logging.info(f"Gesamtzahl der Einträge laut API für {label}: {total_results}")
+                    except ValueError:
+                        logging.warning(f"Konnte 'Total-Results' Header nicht als Zahl interpretieren ({label}).")
+                        total_results = -1
             
-            items_json = response.json()
-            if not isinstance(items_json, list):
-                logging.error(f"Unerwartete Antwort von Zotero API ({ag_name_label_override}): Erwartete Liste, bekam {type(items_json)}.")
-                break
-            if not items_json:
-                logging.info(f"Keine weiteren Einträge für {ag_name_label_override} gefunden.")
-                break
+                # orjson dekodiert direkt aus den Rohbytes, ohne Umweg über einen dekodierten Text
+                items_json = orjson.loads(response.content) if HAS_ORJSON else response.json()
+                if not isinstance(items_json, list):
+                    logging.error(f"Unerwartete Antwort von Zotero API ({label}): Erwartete Liste, bekam {type(items_json)}.")
+                    return None
+                if not items_json:
+                    logging.info(f"Keine weiteren Einträge für {label} gefunden.")
+                    break
             
-            logging.info(f"{len(items_json)} Einträge auf dieser Seite für {ag_name_label_override} gefunden.")
-
-            for item in items_json:
-                try:
-                    item_data = item.get('data', {})
-                    if not isinstance(item_data, dict):
-                        logging.warning(f"Unerwartetes 'data'-Format für Item {item.get('key', '')}, überspringe.")
-                        continue
-                    
-                    date_str = item_data.get('date')
-                    all_items_data.append({
-                        'zotero_key': item.get('key') or item_data.get('key'),
-                        'authors': format_authors(item_data.get('creators', []), single_author_mode),
-                        'year': extract_year(date_str),
-                        'parsed_date': parse_date(date_str),
-                        'title': clean_html(item_data.get('title', '')),
-                        'journal': clean_html(item_data.get('journalAbbreviation')) or clean_html(item_data.get('publicationTitle')),
-                        'volume': str(item_data.get('volume', '')).strip(),
-                        'link': find_best_link_json(item_data, fallback_url=current_fallback_url),
-                        'categories': get_categories_json(item_data, date_str),
-                    })
-                except Exception as e:
-                    logging.error(f"Fehler beim Verarbeiten von Item (Key: {item.get('key', 'N/A')}): {e}", exc_info=True)
+                logging.debug("%d Einträge auf dieser Seite für %s gefunden.", len(items_json), label)
+                all_items_json.extend(items_json)
             
-            start += len(items_json)
-            if total_results is not None and total_results != -1 and start >= total_results:
-                break
-            if len(items_json) < limit_param:
-                break
+                if total_results is not None and total_results != -1 and start + len(items_json) >= total_results:
+                    break
+                if len(items_json) < limit_param:
+                    break
         except requests.exceptions.RequestException as e:
-            logging.error(f"Netzwerk- oder HTTP-Fehler bei API-Abruf für {ag_name_label_override}: {e}")
-            break
+            logging.error(f"Netzwerk- oder HTTP-Fehler bei API-Abruf für {label}: {e}")
+            return None
         except Exception as e:
-            logging.error(f"Unerwarteter Fehler während des API-Abrufs für {ag_name_label_override}: {e}", exc_info=True)
-            break
-            
-    all_items_data.sort(key=lambda item: item['parsed_date'], reverse=True)
+            logging.error(f"Unerwarteter Fehler während des API-Abrufs für {label}: {e}", exc_info=True)
+            return None
+        
+        if not library_changed:
+            return all_items_json, library_version
+        if attempt == MAX_VERSION_RETRIES:
+            logging.error(f"Zotero-Bibliothek ändert sich fortlaufend, Abruf für {label} abgebrochen. Bestehende Feeds bleiben erhalten.")
+            return None
+        logging.warning(f"Zotero-Bibliothek wurde während des Abrufs für {label} geändert, starte Abruf neu ({attempt + 1}/{MAX_VERSION_RETRIES}).")
+
+def fetch_deleted_item_keys(group_id_param, since_version, library_version):
+    """Fragt die seit since_version endgültig gelöschten Item-Keys ab (None bei Fehlern).
+    Die Abfrage ist an library_version gebunden, damit keine Löschung zwischen beiden Abfragen verloren geht.
+    """
+    headers = {}
+    if library_version is not None:
+        headers['If-Unmodified-Since-Version'] = str(library_version)
+    try:
+        response = SESSION.get(f"https://api.zotero.org/groups/{group_id_param}/deleted",
+                               params={'since': since_version}, headers=headers, timeout=120)
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Netzwerk- oder HTTP-Fehler beim Abruf der gelöschten Einträge: {e}")
+        return None
+    if response.status_code == 412:
+        logging.warning("Zotero-Bibliothek wurde während des Abgleichs geändert, Abgleich wird beim nächsten Lauf wiederholt.")
+        return None
+    if response.status_code != 200:
+        logging.error(f"Fehler beim Abruf der gelöschten Einträge. Status: {response.status_code}, URL: {response.url}")
+        return None
+    try:
+        deleted_json = orjson.loads(response.content) if HAS_ORJSON else response.json()
+        deleted_keys = deleted_json.get('items', [])
+    except (ValueError, AttributeError) as e: # ValueError umfasst orjson.JSONDecodeError und json.JSONDecodeError
+        logging.error(f"Unerwartete Antwort beim Abruf der gelöschten Einträge: {e}")
+        return None
+    if not isinstance(deleted_keys, list) or not all(isinstance(key, str) for key in deleted_keys):
+        logging.error(f"Unerwartetes Format der gelöschten Einträge: Erwartete Liste von Keys, bekam {deleted_keys!r}.")
+        return None
+    return deleted_keys
+
+def sync_zotero_items(group_id_param, item_type_param, sort_by_param, direction_param, limit_param):
+    """Bringt den Item-Zwischenspeicher auf den aktuellen Stand der Gruppenbibliothek.
+    Mit gültigem Zwischenspeicher werden nur die seit dessen Version geänderten und gelöschten Einträge abgerufen ('since'),
+    sonst alle Einträge. Gibt (Dict Key -> Item-Daten, Bibliotheksversion) zurück, None bei Fehlern.
+    Änderungen werden über alle Items abgefragt (nicht nur Top-Level): Wird ein eigenständiger Eintrag (z.B. PDF oder Notiz)
+    nachträglich einem Eltern-Item untergeordnet, taucht er in 'items/top' nicht mehr auf und muss anhand von 'parentItem' entfernt werden.
+    """
+    fetch_url = f"https://api.zotero.org/groups/{group_id_param}/{item_type_param}"
+    # 'include=data' explizit: nur die Item-Felder anfordern, keine zusätzlich gerenderten Formate (bib/citation)
+    params = {'format': 'json', 'include': 'data', 'sort': sort_by_param, 'direction': direction_param, 'limit': limit_param}
+    item_cache = read_item_cache(group_id_param)
+
+    if item_cache is None:
+        logging.info("Starte vollständigen Abruf von Zotero (gesamte Gruppe).")
+        result = fetch_zotero_item_pages(fetch_url, params, "Gesamtinstitut")
+        if result is None:
+            return None
+        items_json, library_version = result
+        items_by_key = {}
+    else:
+        cache_version, items_by_key = item_cache
+        logging.info(f"Starte Abruf der seit Version {cache_version} geänderten Einträge ({len(items_by_key)} Einträge zwischengespeichert).")
+        # 'includeTrashed': in den Papierkorb verschobene Einträge kommen mit 'deleted' zurück und werden entfernt
+        changes_url = f"https://api.zotero.org/groups/{group_id_param}/{ZOTERO_CHANGES_ITEM_TYPE}"
+        result = fetch_zotero_item_pages(changes_url, {**params, 'since': cache_version, 'includeTrashed': 1}, "Gesamtinstitut (Änderungen)")
+        if result is None:
+            return None
+        items_json, library_version = result
+        deleted_keys = fetch_deleted_item_keys(group_id_param, cache_version, library_version)
+        if deleted_keys is None:
+            return None
+        for key in deleted_keys:
+            items_by_key.pop(key, None)
+        logging.info(f"{len(items_json)} geänderte und {len(deleted_keys)} gelöschte Einträge seit Version {cache_version}.")
+
+    for item in items_json:
+        # Zotero liefert immer {'key': ..., 'data': {...}}; nur fehlerhafte Einträge landen im except-Zweig
+        try:
+            item_key = item['key'] # Zotero spiegelt den Key in 'data', eine zweite Abfrage ist unnötig
+            item_data = item['data']
+            # Gelöschte und untergeordnete Einträge (Anhänge, Notizen) gehören nicht in die Feeds
+            is_excluded = item_data.get('deleted') or item_data.get('parentItem')
+        except (KeyError, TypeError, AttributeError):
+            logging.warning(f"Unerwartetes Format für Item, überspringe: {item}")
+            continue
+        if is_excluded:
+            items_by_key.pop(item_key, None)
+        else:
+            items_by_key[item_key] = {field: item_data[field] for field in CACHED_ITEM_FIELDS if field in item_data}
+    return items_by_key, library_version
+
+def prepare_feed_items(items_by_key, sort_by_param, direction_param, collection_key_param=None, feed_label_param="Gesamtinstitut"):
+    """Bereitet die bereits abgeglichenen Einträge (siehe sync_zotero_items) für einen Feed auf und sortiert sie nach Publikationsdatum.
+    Es findet kein Netzwerkzugriff statt.
+    Für Arbeitsgruppen werden nur die Einträge der jeweiligen Collection verwendet.
+    Die Autoren bleiben als 'creators'-Liste erhalten und werden erst beim Schreiben je Modus formatiert,
+    sodass beide Modi dieselben aufbereiteten Daten verwenden.
+    """
+    if collection_key_param:
+        current_fallback_url = f"https://www.zotero.org/groups/{GROUP_ID}/collections/{collection_key_param}/items"
+        raw_items = [item_data for item_data in items_by_key.values() if collection_key_param in item_data.get('collections', ())]
+    else:
+        current_fallback_url = f"https://www.zotero.org/groups/{GROUP_ID}/library"
+        raw_items = list(items_by_key.values())
+    # Reihenfolge des API-Abrufs nachbilden, damit Einträge mit gleichem Publikationsdatum stabil sortiert bleiben
+    raw_items.sort(key=lambda item_data: str(item_data.get(sort_by_param, '')), reverse=(direction_param == 'desc'))
+
+    # (Publikationsdatum, Item)-Paare: das Datum wird nur zum Sortieren benötigt und nicht im Item gespeichert
+    dated_items = []
+    # Mehrfach pro Item benötigte Funktionen lokal binden (schneller als die globale Namensauflösung)
+    append_item, clean = dated_items.append, clean_html
+    for item_data in raw_items:
+        try:
+            get_field = item_data.get
+            date_str = get_field('date')
+            year = extract_year(date_str)
+            append_item((parse_date(date_str), {
+                'zotero_key': get_field('key'),
+                'creators': get_field('creators', []),
+                'year': year,
+                'title': clean(get_field('title', '')),
+                'journal': clean(get_field('journalAbbreviation')) or clean(get_field('publicationTitle')),
+                'volume': str(get_field('volume', '')).strip(),
+                'link': find_best_link_json(item_data, fallback_url=current_fallback_url),
+                'categories': get_categories_json(date_str, year),
+            }))
+        except Exception as e:
+            logging.error(f"Fehler beim Verarbeiten von Item (Key: {item_data.get('key', 'N/A')}): {e}", exc_info=True)
+        
+    dated_items.sort(key=itemgetter(0), reverse=True)
+    all_items_data = [item for _, item in dated_items]
     
-    logging.info(f"Insgesamt {len(all_items_data)} Einträge von Zotero für {ag_name_label_override} erfolgreich für den Feed vorbereitet und sortiert.")
+    logging.info(f"Insgesamt {len(all_items_data)} Einträge für {feed_label_param} für den Feed aufbereitet und sortiert.")
     return all_items_data
 
-def create_rss_feed(items_data, output_filename_param, channel_title_param, channel_link_param,
-                    channel_description_param, channel_language_param, feed_url_atom_param, generator_label_param):
-    """Erstellt den RSS Feed im XML-Format aus den vorbereiteten und sortierten Item-Daten."""
-    if not items_data:
-        logging.warning(f"Keine Einträge für {generator_label_param} zum Erstellen des Feeds '{output_filename_param}' vorhanden.")
+def read_library_version():
+    """Liest die beim letzten erfolgreichen Lauf gespeicherte Zotero-Bibliotheksversion (None, falls nicht vorhanden)."""
+    try:
+        with open(LIBRARY_VERSION_FILENAME, encoding='utf-8') as f:
+            return int(f.read().strip())
+    except FileNotFoundError:
         return None
-    
-    ET.register_namespace('atom', ATOM_NS)
-    rss = ET.Element('rss', version="2.0")
-    channel = ET.SubElement(rss, 'channel')
-
-    ET.SubElement(channel, 'title').text = channel_title_param
-    ET.SubElement(channel, 'link').text = channel_link_param
-    ET.SubElement(channel, 'description').text = channel_description_param
-    if channel_language_param:
-        ET.SubElement(channel, 'language').text = channel_language_param
-    now_rfc822 = datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S GMT')
-    ET.SubElement(channel, 'lastBuildDate').text = now_rfc822
-    ET.SubElement(channel, 'pubDate').text = now_rfc822
-    ET.SubElement(channel, 'generator').text = f"Zotero Feed Generator Script ({generator_label_param})"
-
-    atom_link_attrib = { 'href': feed_url_atom_param, 'rel': 'self', 'type': 'application/rss+xml' }
-    ET.SubElement(channel, f'{{{ATOM_NS}}}link', attrib=atom_link_attrib)
-
-    item_count = 0
+    except (OSError, ValueError) as e:
+        logging.warning(f"Konnte gespeicherte Bibliotheksversion aus '{LIBRARY_VERSION_FILENAME}' nicht lesen: {e}")
+        return None
+
+def write_library_version(version):
+    """Speichert die Zotero-Bibliotheksversion für den bedingten Abruf beim nächsten Lauf."""
+    try:
+        with open(LIBRARY_VERSION_FILENAME, 'w', encoding='utf-8') as f:
+            f.write(f"{version}\n")
+        logging.info(f"Bibliotheksversion {version} in '{LIBRARY_VERSION_FILENAME}' gespeichert.")
+    except OSError as e:
+        logging.error(f"Fehler beim Schreiben der Bibliotheksversion nach '{LIBRARY_VERSION_FILENAME}': {e}")
+
+def check_library_modified(group_id_param, item_type_param, last_version):
+    """Prüft mit einem bedingten Request ('If-Modified-Since-Version'), ob sich die Gruppenbibliothek geändert hat.
+    Gibt (geändert, aktuelle Version) zurück. Im Zweifel (Fehler, fehlender Header) gilt die Bibliothek als geändert.
+    """
+    probe_url = f"https://api.zotero.org/groups/{group_id_param}/{item_type_param}"
+    headers = {}
+    if last_version is not None:
+        headers['If-Modified-Since-Version'] = str(last_version)
+    try:
+        response = SESSION.get(probe_url, params={'format': 'keys', 'limit': 1}, headers=headers, timeout=120)
+    except requests.exceptions.RequestException as e:
+        logging.warning(f"Versionsprüfung der Zotero-Bibliothek fehlgeschlagen, erzeuge Feeds vollständig neu: {e}")
+        return True, None
+
+    if response.status_code == 304:
+        return False, last_version
+    if response.status_code != 200:
+        logging.warning(f"Unerwarteter Status {response.status_code} bei der Versionsprüfung, erzeuge Feeds vollständig neu.")
+        return True, None
+    try:
+        return True, int(response.headers['Last-Modified-Version'])
+    except (KeyError, ValueError):
+        logging.warning("Antwort der Versionsprüfung enthält keinen gültigen 'Last-Modified-Version' Header.")
+        return True, None
+
+def read_item_cache(group_id_param):
+    """Liest den Item-Zwischenspeicher des letzten Laufs und gibt (Version, Dict Key -> Item-Daten) zurück.
+    Fehlt die Datei, gehört sie zu einer anderen Gruppe oder enthält andere Felder, wird None zurückgegeben (vollständiger Abruf).
+    """
+    try:
+        with open(ITEM_CACHE_FILENAME, 'rb') as f:
+            cache_bytes = f.read()
+        item_cache = orjson.loads(cache_bytes) if HAS_ORJSON else json.loads(cache_bytes)
+        if item_cache.get('group_id') != group_id_param or item_cache.get('fields') != list(CACHED_ITEM_FIELDS):
+            logging.info(f"Item-Zwischenspeicher '{ITEM_CACHE_FILENAME}' passt nicht zur aktuellen Konfiguration und wird neu aufgebaut.")
+            return None
+        cached_items = item_cache['items']
+        if not isinstance(cached_items, dict) or not all(isinstance(item_data, dict) for item_data in cached_items.values()):
+            logging.warning(f"Item-Zwischenspeicher '{ITEM_CACHE_FILENAME}' hat ein unerwartetes Format, rufe alle Einträge ab.")
+            return None
+        return int(item_cache['version']), cached_items
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        logging.warning(f"Konnte Item-Zwischenspeicher aus '{ITEM_CACHE_FILENAME}' nicht lesen, rufe alle Einträge ab: {e}")
+        return None
+
+def write_item_cache(group_id_param, version, items_by_key):
+    """Speichert die Item-Daten mit ihrer Bibliotheksversion atomar (temporäre Datei + os.replace)."""
+    item_cache = {'group_id': group_id_param, 'version': version, 'fields': list(CACHED_ITEM_FIELDS), 'items': items_by_key}
+    tmp_filename = f"{ITEM_CACHE_FILENAME}.tmp"
+    try:
+        # Sortierte Keys und Zeilenumbrüche halten die Änderungen im Repository klein und lesbar
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(item_cache, f, ensure_ascii=False, sort_keys=True, indent=1)
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, ITEM_CACHE_FILENAME)
+        logging.info(f"{len(items_by_key)} Einträge (Version {version}) in '{ITEM_CACHE_FILENAME}' zwischengespeichert.")
+    except OSError as e:
+        logging.error(f"Fehler beim Schreiben des Item-Zwischenspeichers nach '{ITEM_CACHE_FILENAME}': {e}")
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+
+def feed_files_equal(filename_a, filename_b):
+    """Vergleicht zwei Feed-Dateien zeilenweise, ohne sie vollständig einzulesen.
+    Die Zeitstempel (lastBuildDate/pubDate) werden dabei ignoriert.
+    """
+    with open(filename_a, 'rb') as file_a, open(filename_b, 'rb') as file_b:
+        for line_a, line_b in zip_longest(file_a, file_b):
+            if line_a is None or line_b is None:
+                return False
+            if line_a != line_b and FEED_TIMESTAMP_RE.sub(b'', line_a) != FEED_TIMESTAMP_RE.sub(b'', line_b):
+                return False
+    return True
+
+def write_feed_if_changed(feed_chunks, output_filename_param):
+    """Schreibt die Textstücke des Feeds fortlaufend in eine temporäre Datei und ersetzt die bestehende
+    Datei atomar (os.replace), aber nur bei inhaltlicher Änderung. Gibt True zurück, wenn geschrieben wurde.
+    """
+    tmp_filename = f"{output_filename_param}.tmp"
+    try:
+        with open(tmp_filename, 'w', encoding='utf-8', newline='', buffering=FEED_WRITE_BUFFER_SIZE) as f:
+            f.writelines(feed_chunks)
+            f.flush()
+            feed_unchanged = os.path.exists(output_filename_param) and feed_files_equal(tmp_filename, output_filename_param)
+            if not feed_unchanged:
+                os.fsync(f.fileno()) # Inhalt muss auf dem Datenträger sein, bevor os.replace die alte Datei ersetzt
+        if feed_unchanged:
+            os.remove(tmp_filename)
+            return False
+        os.replace(tmp_filename, output_filename_param)
+    except Exception:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+    return True
+
+def format_rfc822_date(dt):
+    """Formatiert einen UTC-Zeitpunkt als RFC-822-Datum (z.B. 'Sun, 15 Jun 2025 08:11:18 GMT') ohne strftime (etwas schneller)."""
+    return (f"{RFC822_WEEKDAYS[dt.weekday()]}, {dt.day:02d} {RFC822_MONTHS[dt.month - 1]} {dt.year} "
+            f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} GMT")
+
+@lru_cache(maxsize=LRU_CACHE_SIZE)
+def escape_category(category_name):
+    """Maskiert einen Kategorienamen für XML. Kategorien (Jahre, Datumsangaben) wiederholen sich über viele Einträge."""
+    return escape(category_name)
+
+def build_rss_item_title(authors, year, paper_title, journal_name, volume_number):
+    """Setzt den Item-Titel im Zitierformat "Autoren (Jahr) Titel. Zeitschrift. Band" zusammen (reine Funktion ohne Seiteneffekte).
+    Alle Teile sind bereits in prepare_feed_items bereinigte Strings ohne umgebende Leerzeichen.
+    """
+    title_parts = []
+    if authors: title_parts.append(authors)
+    if year: title_parts.append(f"({year})")
+    title_parts.append(paper_title)
+    if journal_name: title_parts.append(journal_name)
+    if volume_number: title_parts.append(volume_number)
+
+    # Teile mit ". " verbinden; vor "(Jahr)" und nach einem Teil, der mit ")" endet, nur ein Leerzeichen
+    non_empty_parts = [part for part in title_parts if part]
+    title_pieces = non_empty_parts[:1]
+    for previous_part, part_str in zip(non_empty_parts, non_empty_parts[1:]):
+        title_pieces.append(" " if part_str.startswith('(') or previous_part.endswith(')') else ". ")
+        title_pieces.append(part_str)
+    return "".join(title_pieces)
+
+def iter_rss_item_blocks(items_data, single_author_mode, pub_date_param, generator_label_param):
+    """Erzeugt nacheinander die fertig formatierten <item>-Blöcke, sodass immer nur ein Item als Text im Speicher liegt."""
     for item_data in items_data:
-        item = ET.SubElement(channel, 'item')
-        title_parts = []
-        authors = item_data.get('authors')
-        year = item_data.get('year')
-        paper_title = item_data.get('title', '[Titel nicht verfügbar]')
-        journal_name = item_data.get('journal')
-        volume_number = item_data.get('volume')
-        
-        if authors: title_parts.append(authors)
-        if year: title_parts.append(f"({year})")
-        title_parts.append(paper_title)
-        if journal_name: title_parts.append(journal_name)
-        if volume_number: title_parts.append(volume_number)
-        
-        rss_item_title = ""
-        for i, part in enumerate(title_parts):
-            part_str = str(part).strip()
-            if not part_str: continue
-            if i == 0:
-                rss_item_title += part_str
-            elif part_str.startswith('('):
-                rss_item_title += f" {part_str}"
-            else:
-                if rss_item_title and not rss_item_title.strip().endswith(')'):
-                    rss_item_title += "."
-                rss_item_title += f" {part_str}"
-        ET.SubElement(item, 'title').text = rss_item_title.strip()
+        authors = format_authors(item_data.get('creators', []), single_author_mode)
+        rss_item_title = build_rss_item_title(authors, item_data.get('year'),
+                                              item_data.get('title', '[Titel nicht verfügbar]'),
+                                              item_data.get('journal'), item_data.get('volume'))
         
         rss_link = item_data.get('link')
         if rss_link:
-            ET.SubElement(item, 'link').text = rss_link
+            link_line = RSS_LINK_TEMPLATE.format(escape(rss_link))
         else:
+            link_line = ""
             logging.warning(f"Item '{rss_item_title[:50]}...' ({generator_label_param}) hat keinen Link. <link>-Tag wird ausgelassen.")
 
         rss_categories = item_data.get('categories', [])
-        if rss_categories:
-            for category_name in rss_categories:
-                if category_name: ET.SubElement(item, 'category').text = str(category_name)
+        category_lines = "".join(RSS_CATEGORY_TEMPLATE.format(escape_category(category_name))
+                                 for category_name in rss_categories if category_name)
         
         guid_text = item_data.get('zotero_key')
         guid_is_permalink = "false"
@@ -381,84 +779,129 @@ def create_rss_feed(items_data, output_filename_param, channel_title_param, chan
             guid_is_permalink = "false"
             logging.warning(f"Item '{rss_item_title[:50]}...' ({generator_label_param}) hat keine GUID, verwende Titel.")
         
-        guid_elem = ET.SubElement(item, 'guid', isPermaLink=guid_is_permalink)
-        guid_elem.text = str(guid_text)
+        yield RSS_ITEM_TEMPLATE.format(
+            title=escape(rss_item_title), link=link_line, categories=category_lines,
+            is_permalink=guid_is_permalink, guid=escape(guid_text), pub_date=pub_date_param)
 
-        ET.SubElement(item, 'pubDate').text = now_rfc822
-        item_count += 1
+def create_rss_feed(items_data, output_filename_param, channel_title_param, channel_link_param,
+                    channel_description_param, channel_language_param, feed_url_atom_param, generator_label_param,
+                    single_author_mode=False, build_date_param=None):
+    """Erstellt den RSS Feed im XML-Format aus den vorbereiteten und sortierten Item-Daten.
+    Im single_author_mode wird pro Item nur der erste Autor mit 'et al.' angezeigt.
+    Gibt True zurück, wenn der Feed geschrieben (oder unverändert) ist, False bei Schreibfehlern und None ohne Einträge.
+    build_date_param ist der RFC-822-Zeitstempel des Laufs (wird sonst hier ermittelt).
+    """
+    if not items_data:
+        logging.warning(f"Keine Einträge für {generator_label_param} zum Erstellen des Feeds '{output_filename_param}' vorhanden.")
+        return None
+    
+    now_rfc822 = build_date_param or format_rfc822_date(datetime.now(timezone.utc))
+    language_line = RSS_LANGUAGE_TEMPLATE.format(escape(channel_language_param)) if channel_language_param else ""
+    channel_header = RSS_CHANNEL_HEADER_TEMPLATE.format(
+        atom_ns=escape(ATOM_NS, ATTRIBUTE_ENTITIES), title=escape(channel_title_param),
+        link=escape(channel_link_param), description=escape(channel_description_param), language=language_line,
+        build_date=now_rfc822, generator=escape(f"Zotero Feed Generator Script ({generator_label_param})"),
+        feed_url=escape(feed_url_atom_param, ATTRIBUTE_ENTITIES))
+
+    feed_chunks = chain((channel_header,), iter_rss_item_blocks(items_data, single_author_mode, now_rfc822, generator_label_param), (RSS_FEED_FOOTER,))
+    item_count = len(items_data)
     
     try:
-        ET.indent(rss, space="  ", level=0)
-        tree = ET.ElementTree(rss)
-        tree.write(output_filename_param, encoding="utf-8", xml_declaration=True, method='xml')
-        logging.info(f"{item_count} Einträge für {generator_label_param} erfolgreich formatiert und in '{output_filename_param}' geschrieben.")
+        if write_feed_if_changed(feed_chunks, output_filename_param):
+            logging.info(f"{item_count} Einträge für {generator_label_param} erfolgreich formatiert und in '{output_filename_param}' geschrieben.")
+        else:
+            logging.info(f"Feed '{output_filename_param}' für {generator_label_param} ist inhaltlich unverändert ({item_count} Einträge), Datei bleibt bestehen.")
         return True
     except Exception as e:
         logging.error(f"Fehler beim Schreiben der RSS-Datei '{output_filename_param}' für {generator_label_param}: {e}")
         return False
 
-def generate_feeds_for_mode(single_author_mode):
-    """Führt die Feed-Generierung für einen bestimmten Modus durch (alle Autoren oder einzelner Autor)."""
+def build_feed_jobs(single_author_mode):
+    """Stellt für einen Modus die Liste aller zu erzeugenden Feeds zusammen: zuerst den Haupt-Feed, dann einen pro Arbeitsgruppe.
+    Jeder Eintrag enthält Dateiname, Kanal-Metadaten und die Collection (None für die gesamte Gruppe),
+    sodass alle Feeds denselben Code-Pfad durchlaufen.
+    """
     mode_suffix = SINGLE_AUTHOR_SUFFIX if single_author_mode else ""
     mode_label = "Single Author" if single_author_mode else "Alle Autoren"
-    logging.info(f"\n=== Starte Generierung für Modus: {mode_label} ===")
-
-    # 1. Haupt-Feed generieren
-    logging.info(f"--- Generiere Haupt-Feed ({mode_label}) ---")
-    main_feed_name_base = MAIN_FEED_FILENAME.replace('.xml', '')
-    main_output_filename = f"{main_feed_name_base}{mode_suffix}.xml"
-    if not single_author_mode:
-        main_output_filename = MAIN_FEED_FILENAME # Für den Standardmodus den Originalnamen behalten
-
-    main_feed_atom_url = f"https://{GITHUB_USERNAME}.github.io/{REPO_NAME}/{main_output_filename}"
-    main_feed_title = f"IAU Publikationen (Minimal, {mode_label})"
-
-    fetched_main_data = fetch_zotero_items(
-        group_id_param=GROUP_ID, item_type_param=ZOTERO_ITEM_TYPE, sort_by_param=SORT_BY,
-        direction_param=DIRECTION, limit_param=MAX_LIMIT_PER_REQUEST, single_author_mode=single_author_mode
-    )
-    if fetched_main_data:
-        create_rss_feed(
-            items_data=fetched_main_data, output_filename_param=main_output_filename,
-            channel_title_param=main_feed_title, channel_link_param=RSS_CHANNEL_LINK,
-            channel_description_param=f"Publikationen des Instituts für Atmosphäre und Umwelt (IAU) - {mode_label}",
-            channel_language_param=RSS_CHANNEL_LANGUAGE, feed_url_atom_param=main_feed_atom_url,
-            generator_label_param=f"Gesamtinstitut ({mode_label})"
-        )
-
-    # 2. Feeds für Arbeitsgruppen generieren
-    logging.info(f"\n--- Generiere Feeds für einzelne Arbeitsgruppen ({mode_label}) ---")
-    for ag_config in AG_CONFIGURATIONS:
-        ag_key, ag_label, ag_prefix = ag_config["key"], ag_config["label"], ag_config["prefix"]
-        logging.info(f"--- Verarbeite Arbeitsgruppe: {ag_label} ({mode_label}) ---")
 
-        current_output_filename = f"{ag_prefix}{mode_suffix}{DEFAULT_AG_OUTPUT_SUFFIX}"
-        current_rss_channel_title = f"{ag_label} Publikationen (IAU, {mode_label})"
-        current_feed_url = f"https://{GITHUB_USERNAME}.github.io/{REPO_NAME}/{current_output_filename}"
-
-        fetched_ag_data = fetch_zotero_items(
-            group_id_param=GROUP_ID, item_type_param=ZOTERO_ITEM_TYPE, sort_by_param=SORT_BY,
-            direction_param=DIRECTION, limit_param=MAX_LIMIT_PER_REQUEST, single_author_mode=single_author_mode,
-            collection_key_override=ag_key, ag_name_label_override=ag_label
+    def make_job(label, title, description, filename, collection_key):
+        return {
+            "label": label, "title": title, "description": description, "filename": filename,
+            "collection_key": collection_key, "feed_url": f"https://{GITHUB_USERNAME}.github.io/{REPO_NAME}/{filename}",
+            "generator_label": f"{label} ({mode_label})",
+        }
+
+    # Für den Standardmodus den Originalnamen des Haupt-Feeds behalten
+    main_output_filename = MAIN_FEED_FILENAME.replace('.xml', f"{mode_suffix}.xml") if single_author_mode else MAIN_FEED_FILENAME
+    feed_jobs = [make_job(
+        "Gesamtinstitut", f"IAU Publikationen (Minimal, {mode_label})",
+        f"Publikationen des Instituts für Atmosphäre und Umwelt (IAU) - {mode_label}", main_output_filename, None
+    )]
+    feed_jobs.extend(make_job(
+        ag_config["label"], f"{ag_config['label']} Publikationen (IAU, {mode_label})",
+        f"Publikationen der {ag_config['label']}, Institut für Atmosphäre und Umwelt (IAU) - {mode_label}",
+        f"{ag_config['prefix']}{mode_suffix}{DEFAULT_AG_OUTPUT_SUFFIX}", ag_config["key"]
+    ) for ag_config in AG_CONFIGURATIONS)
+    return feed_jobs
+
+def generate_feeds(items_by_key):
+    """Erzeugt alle Feeds in beiden Modi (alle Autoren und einzelner Autor) aus denselben, einmal abgeglichenen Item-Daten.
+    Die Einträge eines Feeds werden nur einmal aufbereitet und sortiert; die Modi unterscheiden sich nur in der Autorenangabe.
+    Gibt True zurück, wenn alle Feeds erfolgreich geschrieben wurden.
+    """
+    all_feeds_written = True
+    # Ein Zeitstempel für alle Feeds und Items des Laufs
+    build_date = format_rfc822_date(datetime.now(timezone.utc))
+    mode_jobs = zip(build_feed_jobs(single_author_mode=False), build_feed_jobs(single_author_mode=True))
+
+    for feed_jobs_by_mode in mode_jobs:
+        feed_label, collection_key = feed_jobs_by_mode[0]["label"], feed_jobs_by_mode[0]["collection_key"]
+        logging.info(f"--- Generiere Feeds: {feed_label} ---")
+        feed_items = prepare_feed_items(
+            items_by_key=items_by_key, sort_by_param=SORT_BY, direction_param=DIRECTION,
+            collection_key_param=collection_key, feed_label_param=feed_label
         )
-        if fetched_ag_data:
-            create_rss_feed(
-                items_data=fetched_ag_data, output_filename_param=current_output_filename,
-                channel_title_param=current_rss_channel_title, channel_link_param=RSS_CHANNEL_LINK,
-                channel_description_param=f"Publikationen der {ag_label}, Institut für Atmosphäre und Umwelt (IAU) - {mode_label}",
-                channel_language_param=RSS_CHANNEL_LANGUAGE, feed_url_atom_param=current_feed_url,
-                generator_label_param=f"{ag_label} ({mode_label})"
+        for single_author_mode, feed_job in zip((False, True), feed_jobs_by_mode):
+            feed_written = create_rss_feed(
+                items_data=feed_items, output_filename_param=feed_job["filename"],
+                channel_title_param=feed_job["title"], channel_link_param=RSS_CHANNEL_LINK,
+                channel_description_param=feed_job["description"],
+                channel_language_param=RSS_CHANNEL_LANGUAGE, feed_url_atom_param=feed_job["feed_url"],
+                generator_label_param=feed_job["generator_label"], single_author_mode=single_author_mode,
+                build_date_param=build_date
             )
-        logging.info(f"--- Verarbeitung für {ag_label} ({mode_label}) abgeschlossen ---\n")
+            # Nur Schreibfehler (False) zählen als Fehlschlag; eine leere Collection (None) ist ein gültiger Zustand
+            all_feeds_written = all_feeds_written and feed_written is not False
+
+    return all_feeds_written
 
 # --- Hauptausführung des Skripts ---
 if __name__ == "__main__":
     logging.info("=== Starte Zotero RSS Feed Generator Skript ===")
-    
-    # Generiere Feeds im Standardmodus (alle Autoren)
-    generate_feeds_for_mode(single_author_mode=False)
-    
-    # Generiere Feeds im Single-Author-Modus
-    generate_feeds_for_mode(single_author_mode=True)
+
+    # Bedingter Abruf: Hat sich die Bibliothek seit dem letzten erfolgreichen Lauf nicht geändert, bleiben die Feeds bestehen
+    last_library_version = read_library_version()
+    library_modified, _ = check_library_modified(GROUP_ID, ZOTERO_ITEM_TYPE, last_library_version)
+
+    if not library_modified:
+        logging.info(f"Zotero-Bibliothek seit Version {last_library_version} unverändert. Vorhandene Feeds werden beibehalten.")
+    else:
+        # Nur die seit dem letzten Lauf geänderten Einträge abrufen; alle Feeds werden aus dem Zwischenspeicher erzeugt
+        sync_result = sync_zotero_items(GROUP_ID, ZOTERO_ITEM_TYPE, SORT_BY, DIRECTION, MAX_LIMIT_PER_REQUEST)
+        if sync_result is None:
+            logging.error("Abgleich mit Zotero fehlgeschlagen. Vorhandene Feeds werden beibehalten.")
+        else:
+            items_by_key, synced_library_version = sync_result
+            if synced_library_version is not None:
+                write_item_cache(GROUP_ID, synced_library_version, items_by_key)
+
+            # Generiere alle Feeds im Standardmodus (alle Autoren) und im Single-Author-Modus
+            feeds_ok = generate_feeds(items_by_key)
+
+            # Version nur speichern, wenn alle Feeds geschrieben wurden, damit fehlgeschlagene Feeds beim nächsten Lauf nachgeholt werden
+            if feeds_ok and synced_library_version is not None:
+                write_library_version(synced_library_version)
+            elif not feeds_ok:
+                logging.warning("Nicht alle Feeds wurden erfolgreich erzeugt. Bibliotheksversion wird nicht gespeichert.")
     
     logging.info("=== Zotero RSS Feed Generator Skript beendet ===")